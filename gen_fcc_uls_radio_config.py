@@ -3,6 +3,7 @@
 import argparse
 import csv
 import glob
+import json
 import os
 import re
 import shutil
@@ -44,18 +45,50 @@ DEFAULT_CHAN_NAME_MAX_LEN = 7
 #    "WILL", "BE", "USED", "FOR", "OF", "LICENSE", "LICENSEE", "PROVIDING"
 #}
 EXCLUDED_CHAN_NAME_WORDS = {}
+GENERIC_CSV_HEADERS = [
+    "Location", "Name", "Frequency", "Duplex", "Offset", "Tone", "rToneFreq", "cToneFreq",
+    "DtcsCode", "DtcsPolarity", "RxDtcsCode", "CrossMode", "Mode", "TStep", "Skip",
+    "Power", "Comment", "URCALL", "RPT1CALL", "RPT2CALL", "DVCODE"
+]
+CHIRP_TUNING_STEPS = ['2.5', '5.0', '6.25', '12.5']
+
+def chirp_tuning_step(formatted_row, result_row, radio_conf_vars):
+    #CHIRP rejects frequencies that aren't a multiple of the channel's tuning step
+    headers = radio_conf_vars.get('csv_headers')
+
+    if 'TStep' not in headers:
+        return formatted_row
+
+    hz = round(float(result_row[0]) * 1000000)
+
+    for step in reversed(CHIRP_TUNING_STEPS):
+        if hz % round(float(step) * 1000) == 0:
+            formatted_row[headers.index('TStep')] = step
+            break
+
+    return formatted_row
+
+RADIO_ROW_TRANSFORMS = {
+    'chirp_tstep': chirp_tuning_step
+}
 SUPPORTED_RADIOS = {
     'generic': {
         'chan_name_max_len': 7,
-        'csv_headers': [
-            "Location", "Name", "Frequency", "Duplex", "Offset", "Tone", "rToneFreq", "cToneFreq",
-            "DtcsCode", "DtcsPolarity", "RxDtcsCode", "CrossMode", "Mode", "TStep", "Skip",
-            "Power", "Comment", "URCALL", "RPT1CALL", "RPT2CALL", "DVCODE"
-        ],
+        'csv_headers': GENERIC_CSV_HEADERS,
         'csv_default_row': [
             "", "", "", "", "0.00000", "", "88.5", "88.5", "023", "NN", "023", "Tone->Tone",
             "FM", "5.0", "", "8.0W", "", "", "", "", ""
         ]
+    },
+    'uv5r': {
+        'chan_name_max_len': 7,
+        'csv_headers': GENERIC_CSV_HEADERS,
+        'csv_default_row': [
+            "", "", "", "", "0.00000", "", "88.5", "88.5", "023", "NN", "023", "Tone->Tone",
+            "NFM", "5.0", "", "High", "", "", "", "", ""
+        ],
+        'bands': [[136.0, 174.0], [400.0, 520.0]],
+        'row_transform': 'chirp_tstep'
     }
 }
 CSV_FILE_PREFIX = 'radio_frequencies_'
@@ -190,69 +223,194 @@ def gen_radio_chan_name(entity, eligibility, state, county, seen,
 
     return new_name, original_idx, new_first
 
-def gen_radio_conf(radio, results, chan_offset=1, chan_name_prefix_src='auto', chan_name_suffix_src='auto', chan_name_max_len=None):
-    radio = radio.lower()
+RADIO_PROFILE_REQUIRED_COLUMNS = ['Location', 'Name', 'Frequency']
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def validate_radio_profile(radio, radio_conf_vars):
+    if not isinstance(radio_conf_vars, dict):
+        raise ValueError(f"Radio profile {radio} must be a JSON object")
+
+    headers = radio_conf_vars.get('csv_headers')
+    default_row = radio_conf_vars.get('csv_default_row')
+
+    for key, value in [('csv_headers', headers), ('csv_default_row', default_row)]:
+        if not isinstance(value, list) or not value or not all(isinstance(v, str) for v in value):
+            raise ValueError(f"Radio profile {radio} must define {key} as a non-empty list of strings")
+
+    if len(headers) != len(default_row):
+        raise ValueError(f"Radio profile {radio} has {len(headers)} csv_headers but {len(default_row)} csv_default_row fields")
+
+    missing = [c for c in RADIO_PROFILE_REQUIRED_COLUMNS if c not in headers]
+
+    if missing:
+        raise ValueError(f"Radio profile {radio} csv_headers is missing required column(s): {', '.join(missing)}")
+
+    max_len = radio_conf_vars.get('chan_name_max_len', DEFAULT_CHAN_NAME_MAX_LEN)
 
-    if radio not in SUPPORTED_RADIOS:
-        raise ValueError(f"Unsupported radio model: {radio}. Supported models: {', '.join(SUPPORTED_RADIOS)}")
+    if not isinstance(max_len, int) or isinstance(max_len, bool) or max_len <= 0:
+        raise ValueError(f"Radio profile {radio} chan_name_max_len must be a positive integer, got: {max_len!r}")
 
-    radio_conf_vars = SUPPORTED_RADIOS[radio]
-    csv_filename = CSV_FILE_PREFIX + radio + '_' + CSV_FILE_SUFFIX
+    bands = radio_conf_vars.get('bands', [])
 
-    with open(csv_filename, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(radio_conf_vars.get('csv_headers'))
+    if not isinstance(bands, list):
+        raise ValueError(f"Radio profile {radio} bands must be a list of [min_mhz, max_mhz], got: {bands!r}")
 
-        chan_name_prefix_str = ''
+    for band in bands:
+        if not isinstance(band, list) or len(band) != 2 or not all(is_number(f) for f in band) or band[0] > band[1]:
+            raise ValueError(f"Radio profile {radio} has an invalid band: {band!r}. Expected [min_mhz, max_mhz]")
 
-        if chan_name_prefix_src not in ['auto', 'city', 'callsign']:
-            chan_name_prefix_str = chan_name_prefix_src
-            chan_name_prefix_src = 'custom'
+    transform = radio_conf_vars.get('row_transform')
 
-        chan_name_suffix_str = ''
+    if transform is not None and (not isinstance(transform, str) or transform not in RADIO_ROW_TRANSFORMS):
+        raise ValueError(f"Radio profile {radio} has an unknown row_transform: {transform!r}. Supported transforms: {', '.join(RADIO_ROW_TRANSFORMS)}")
 
-        if chan_name_suffix_src not in ['auto', 'freq']:
-            chan_name_suffix_str = chan_name_suffix_src
-            chan_name_suffix_src = 'custom'
+def load_radio_profiles(path):
+    #A profile file is a JSON object of radio name -> profile, in the same form as SUPPORTED_RADIOS
+    if os.path.isdir(path):
+        filenames = sorted(glob.glob(os.path.join(path, '*.json')))
+    else:
+        filenames = [path]
+
+    for filename in filenames:
+        with open(filename) as f:
+            try:
+                profiles = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Unable to parse radio profile file {filename}: {e}")
+
+        if not isinstance(profiles, dict):
+            raise ValueError(f"Radio profile file {filename} must contain a JSON object of radio name -> profile")
+
+        for radio, radio_conf_vars in profiles.items():
+            radio = radio.lower()
+            validate_radio_profile(radio, radio_conf_vars)
+
+            if radio in SUPPORTED_RADIOS:
+                print(f"Radio profile {radio} from {filename} replaces the existing {radio} profile")
+            elif verbose:
+                print(f"Loaded radio profile {radio} from {filename}")
 
-        chan_name_max_len = chan_name_max_len or radio_conf_vars.get('chan_name_max_len', DEFAULT_CHAN_NAME_MAX_LEN)
+            SUPPORTED_RADIOS[radio] = radio_conf_vars
 
-        seen_names = {}
-        formatted_rows = []
+def normalize_bands(bands):
+    if not bands:
+        return None
 
-        for idx, row in enumerate(results, start=chan_offset):
-            freq, call_sign, entity, eligibility, city, state, zipc, county, service, status = row
+    return tuple(sorted((float(low), float(high)) for low, high in bands))
 
-            if chan_name_prefix_src in ['auto', 'city']:
-                chan_name_prefix_str = city
-            elif chan_name_prefix_src == 'callsign':
-                chan_name_prefix_str = call_sign
+def freq_in_bands(freq, bands):
+    if not bands:
+        return True
 
-            if chan_name_suffix_src == 'freq':
-                chan_name_suffix_str = freq
+    return any(low <= freq <= high for low, high in bands)
+
+def gen_radio_conf(radio, results, chan_offset=1, chan_name_prefix_src='auto', chan_name_suffix_src='auto', chan_name_max_len=None):
+    gen_radio_confs([radio], results, chan_offset, chan_name_prefix_src, chan_name_suffix_src, chan_name_max_len)
+
+def gen_radio_confs(radios, results, chan_offset=1, chan_name_prefix_src='auto', chan_name_suffix_src='auto', chan_name_max_len=None):
+    radios = list(dict.fromkeys(r.lower() for r in radios))
+
+    for radio in radios:
+        if radio not in SUPPORTED_RADIOS:
+            raise ValueError(f"Unsupported radio model: {radio}. Supported models: {', '.join(SUPPORTED_RADIOS)}")
+
+    chan_name_prefix_str = ''
+
+    if chan_name_prefix_src not in ['auto', 'city', 'callsign']:
+        chan_name_prefix_str = chan_name_prefix_src
+        chan_name_prefix_src = 'custom'
+
+    chan_name_suffix_str = ''
+
+    if chan_name_suffix_src not in ['auto', 'freq']:
+        chan_name_suffix_str = chan_name_suffix_src
+        chan_name_suffix_src = 'custom'
+
+    #Radios with the same max channel name length and band limits output the same rows,
+    #so they share one set of generated names
+    profiles = []
+    name_groups = {}
+
+    for radio in radios:
+        radio_conf_vars = SUPPORTED_RADIOS[radio]
+        max_len = chan_name_max_len or radio_conf_vars.get('chan_name_max_len', DEFAULT_CHAN_NAME_MAX_LEN)
+        bands = normalize_bands(radio_conf_vars.get('bands'))
+        group_key = (max_len, bands)
+
+        if group_key not in name_groups:
+            name_groups[group_key] = {'seen': {}, 'bands': bands, 'profiles': [], 'row_positions': {}}
+
+        headers = radio_conf_vars.get('csv_headers')
+        profile = {
+            'radio': radio,
+            'conf': radio_conf_vars,
+            'transform': RADIO_ROW_TRANSFORMS.get(radio_conf_vars.get('row_transform')),
+            'csv_filename': CSV_FILE_PREFIX + radio + '_' + CSV_FILE_SUFFIX,
+            'location_col': headers.index('Location'),
+            'name_col': headers.index('Name'),
+            'freq_col': headers.index('Frequency'),
+            'formatted_rows': []
+        }
+        profiles.append(profile)
+        name_groups[group_key]['profiles'].append(profile)
+
+    #Rows are buffered rather than written as they are generated, since a later
+    #duplicate channel name can retroactively rename an earlier row
+    for result_idx, row in enumerate(results):
+        freq, call_sign, entity, eligibility, city, state, zipc, county, service, status = row
+        freq_mhz = float(freq)
+
+        if chan_name_prefix_src in ['auto', 'city']:
+            chan_name_prefix_str = city
+        elif chan_name_prefix_src == 'callsign':
+            chan_name_prefix_str = call_sign
+
+        if chan_name_suffix_src == 'freq':
+            chan_name_suffix_str = freq
+
+        for (max_len, bands), group in name_groups.items():
+            if not freq_in_bands(freq_mhz, bands):
+                continue
 
             name, retro_idx, retro_name = gen_radio_chan_name(
-                entity, eligibility, state, county, seen_names,
+                entity, eligibility, state, county, group['seen'],
                 chan_name_prefix_src, chan_name_prefix_str,
                 chan_name_suffix_src, chan_name_suffix_str,
-                chan_name_max_len,
-                current_idx=idx - chan_offset
+                max_len,
+                current_idx=result_idx
             )
 
-            formatted_row = radio_conf_vars.get('csv_default_row').copy()
-            formatted_row[0] = str(idx)
-            formatted_row[1] = name
-            formatted_row[2] = f"{float(freq):.5f}"
-            formatted_rows.append(formatted_row)
+            position = len(group['row_positions'])
+            group['row_positions'][result_idx] = position
+
+            for profile in group['profiles']:
+                formatted_row = profile['conf'].get('csv_default_row').copy()
+                formatted_row[profile['location_col']] = str(chan_offset + position)
+                formatted_row[profile['name_col']] = name
+                formatted_row[profile['freq_col']] = f"{freq_mhz:.5f}"
+
+                if profile['transform']:
+                    formatted_row = profile['transform'](formatted_row, row, profile['conf'])
+
+                profile['formatted_rows'].append(formatted_row)
 
-            #Retroactively rename previous row if needed
-            if retro_idx is not None and retro_name is not None:
-                formatted_rows[retro_idx][1] = retro_name
+                #Retroactively rename previous row if needed
+                if retro_idx is not None and retro_name is not None:
+                    profile['formatted_rows'][group['row_positions'][retro_idx]][profile['name_col']] = retro_name
 
-        for row in formatted_rows:
-            writer.writerow(row)
+    for profile in profiles:
+        if not profile['formatted_rows']:
+            print(f"\nWarning: No results within the frequency bands of radio model {profile['radio']}, CSV file not written")
+            continue
 
-    print(f"\nCSV file written: {csv_filename}")
+        with open(profile['csv_filename'], 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(profile['conf'].get('csv_headers'))
+            writer.writerows(profile['formatted_rows'])
+
+        print(f"\nCSV file written: {profile['csv_filename']}")
 
 def download_with_progress(url, filename):
     print(f"Downloading: {url}")
@@ -458,8 +616,9 @@ def list_available_zip_files():
 
 def main():
     parser = argparse.ArgumentParser(description=SELF_DESC)
-    parser.add_argument('-lr', '--list-radios', action='store_true', help="List supported radio models (currently only : generic, for possible future use)")
-    parser.add_argument('-r', '--radio', default='generic', help="Output results formatted for specified radio model (currently only : generic, works with CHIRP and Odmaster, confirmed on TIDRADIO TD-H8)")
+    parser.add_argument('-lr', '--list-radios', action='store_true', help="List supported radio models, including any loaded with --radio-profiles")
+    parser.add_argument('-r', '--radio', default='generic', help="Comma-separated radio model(s) to output results formatted for, one CSV file per model from a single pass over the results (e.g., generic,uv5r). Default : generic (works with CHIRP and Odmaster, confirmed on TIDRADIO TD-H8)")
+    parser.add_argument('-rp', '--radio-profiles', help="Comma-separated JSON radio profile file(s) or directories of *.json files to add to the supported radio models. Each file is a JSON object of radio name -> profile with csv_headers, csv_default_row, and optionally chan_name_max_len, bands (list of [min_mhz, max_mhz]) and row_transform (" + ", ".join(RADIO_ROW_TRANSFORMS) + ")")
     parser.add_argument('-co', '--channel-offset', type=int, default=1, help="Starting number for channel field in CSV output. Default: 1")
     parser.add_argument('-cp', '--channel-prefix', default='auto', help="Method used to generate channel name prefixes : auto (Default. Obtained dynamically based on keywords in the entity and eligibility fields), city (The first two characters of the city name if its one word, or the first character of each word in the city name e.g, NY), callsign, or a custom string. Length will be trimmed to max length for the model radio specified, unless overriden with --channel-max")
  
@@ -489,11 +648,24 @@ def main():
         global verbose
         verbose = args.verbose
 
-    if args.radio and args.radio.lower() not in SUPPORTED_RADIOS:
-        print(f"Error: Unsupported radio model '{args.radio}'.")
-        print("Supported radio models:")
-        print(", ".join(SUPPORTED_RADIOS))
-        sys.exit(1)
+    if args.radio_profiles:
+        for path in [p.strip() for p in args.radio_profiles.split(',')]:
+            try:
+                load_radio_profiles(path)
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+
+    radios = [r.strip().lower() for r in args.radio.split(',') if r.strip()] if args.radio else []
+
+    if args.radio is not None:
+        unsupported = [r for r in radios if r not in SUPPORTED_RADIOS]
+
+        if not radios or unsupported:
+            print(f"Error: Unsupported radio model(s) '{', '.join(unsupported) or args.radio}'.")
+            print("Supported radio models:")
+            print(", ".join(SUPPORTED_RADIOS))
+            sys.exit(1)
 
     if args.list_radios:
         print("Supported radio models:")
@@ -642,10 +814,10 @@ def main():
             freq, call_sign, name, eligibility, city, state, zipc, county, service, status = row
             print(f"Freq: {freq} MHz, Call Sign: {call_sign}, Entity: {name}, City/State/ZIP/County: {city}/{state}/{zipc}/{county}, Service: {service}, Eligibility: {eligibility}, Status: {status}")
 
-        if args.radio:
+        if radios:
             try:
-                gen_radio_conf(
-                    args.radio,
+                gen_radio_confs(
+                    radios,
                     search_results,
                     chan_offset=args.channel_offset,
                     chan_name_prefix_src=args.channel_prefix,